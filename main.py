@@ -1,9 +1,35 @@
 import os
 import re
 import json
+import asyncio
+import atexit
+import collections
+import functools
+import logging
+import random
+import shelve
+import time
 import autogen
 from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
 
+# orjson is noticeably faster than the stdlib encoder for the small dicts
+# exchanged on every tool call; fall back to stdlib when it is not installed.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling
+# is identical on both paths.
+try:
+    import orjson
+
+    def _loads(s):
+        return orjson.loads(s)
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
+
 # --------------------------
 # Global Configuration & Retry Helpers
 # --------------------------
@@ -20,7 +46,40 @@ to ensure proper routing and execution of function calls.
 """
 
 MAX_RETRIES = 3  # Maximum number of retry attempts for API calls
-retry_counts = {}  # Dictionary to track retry counts for different API calls
+retry_counts = collections.Counter()  # Tracks retry counts for different API calls
+
+# Debug tracing is opt-in via SIA_DEBUG=1 and routed through the "sia"
+# logger. Call sites pass %-style format strings plus arguments, so when the
+# DEBUG level is disabled no formatting work happens at all.
+DEBUG = os.environ.get("SIA_DEBUG") == "1"
+
+logger = logging.getLogger("sia")
+if DEBUG and not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
+
+def _dbg(msg, *args):
+    logger.debug(msg, *args)
+
+# Pre-compiled patterns for detecting and parsing FUNCTION_CALL messages.
+# Compiling once at import time avoids re-running the regex compiler (or its
+# cache lookup) on every message that flows through the group chat.
+_FUNC_CALL_RE = re.compile(r'^\s*FUNCTION_CALL:(\w+)\s*(\{.*\})\s*$', re.DOTALL)
+_FUNC_CALL_MATCH_RE = re.compile(r'^\s*FUNCTION_CALL:\w+\s*\{.*\}\s*$', re.DOTALL)
+# Several inline calls in one message, or an explicit batch, execute in a
+# single executor pass instead of costing one LLM round-trip apiece.
+_FUNC_CALL_ITER_RE = re.compile(r'FUNCTION_CALL:(\w+)\s*(\{.*?\})', re.DOTALL)
+_FUNC_CALL_BATCH_RE = re.compile(r'^\s*FUNCTION_CALL_BATCH:\s*(\[.*\])\s*$', re.DOTALL)
+
+
+def _ends_terminate(content: str) -> bool:
+    """
+    Check whether a message ends with the TERMINATE marker.
+
+    Only the last few characters are stripped, so a multi-KB LLM reply is
+    not copied in full just to inspect its suffix.
+    """
+    return content[-32:].rstrip().endswith("TERMINATE")
 
 # Azure OpenAI API Configuration
 config_list = [{
@@ -31,46 +90,180 @@ config_list = [{
     "api_version": "2024-02-15-preview"
 }]
 
-def get_retry_count(key: str) -> int:
+def get_retry_count(key) -> int:
     """
     Get the current retry count for a specific key.
     
     Args:
-        key: The identifier for the API call being tracked
+        key: Opaque hashable identifier for the API call being tracked
         
     Returns:
         int: The current retry count (0 if not previously tracked)
     """
-    return retry_counts.get(key, 0)
+    return retry_counts[key]
 
-def increment_retry(key: str) -> int:
+def increment_retry(key) -> int:
     """
     Increment the retry count for a specific key.
     
     Args:
-        key: The identifier for the API call being tracked
+        key: Opaque hashable identifier for the API call being tracked
         
     Returns:
         int: The updated retry count after incrementing
     """
-    retry_counts[key] = get_retry_count(key) + 1
-    print(f"DEBUG: Incrementing retry for {key}: {retry_counts[key]}")
+    retry_counts[key] += 1
+    _dbg("DEBUG: Incrementing retry for %s: %s", key, retry_counts[key])
     return retry_counts[key]
 
-def reset_retries(key: str):
+def _retry_delay_ms(count: int) -> int:
+    """
+    Compute the backoff delay for retry attempt `count` (1-based).
+
+    Exponential backoff with random jitter keeps repeated attempts from
+    re-firing in lockstep: 100ms, 200ms, 400ms... plus up to 100ms of noise.
+
+    Args:
+        count: The retry attempt number, starting at 1
+
+    Returns:
+        int: The delay to wait before the next attempt, in milliseconds
+    """
+    return int((2 ** (count - 1)) * 100 + random.uniform(0, 100))
+
+def reset_retries(key):
     """
     Reset the retry count for a specific key.
     
     Args:
-        key: The identifier for the API call to reset
+        key: Opaque hashable identifier for the API call to reset
+    """
+    _dbg("DEBUG: Resetting retries for %s", key)
+    retry_counts.pop(key, None)
+
+# --------------------------
+# Persistent Tool-Result Cache
+# --------------------------
+# Deterministic tool results are also cached on disk so they survive process
+# restarts; the in-process lru_cache still serves repeat hits within a run.
+_CACHE_FILE = ".sia_toolcache"
+_cache = None
+
+
+def _get_cache():
+    """
+    Lazily open the shelve-backed tool cache, or disable it on failure.
+
+    Returns:
+        The open shelf, or None when persistent caching is unavailable
+        (e.g. read-only filesystem).
+    """
+    global _cache
+    if _cache is None:
+        try:
+            _cache = shelve.open(_CACHE_FILE, writeback=False)
+            atexit.register(_cache.close)
+        except Exception:
+            _cache = False
+    return _cache or None
+
+
+def persistent_cache(ttl_seconds: int = 86400):
+    """
+    Cache a deterministic function's results on disk across sessions.
+
+    Entries are keyed on (function name, args) and expire after ttl_seconds.
+    Only apply this to pure functions — the "5"-prefix retry simulation is
+    deliberately kept out of the decorated cores.
+
+    Args:
+        ttl_seconds: How long a cached entry stays valid, in seconds
+
+    Returns:
+        A decorator wrapping the function with the persistent cache
     """
-    if key in retry_counts:
-        print(f"DEBUG: Resetting retries for {key}")
-        del retry_counts[key]
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            cache = _get_cache()
+            if cache is None:
+                return fn(*args)
+            key = repr((fn.__name__, args))
+            entry = cache.get(key)
+            now = time.time()
+            if entry is not None and now - entry[0] < ttl_seconds:
+                return entry[1]
+            result = fn(*args)
+            try:
+                cache[key] = (now, result)
+            except Exception:
+                pass  # a failed write just means no cross-session hit
+            return result
+        return wrapper
+    return decorator
+
 
 # --------------------------
 # Function Implementations for API Calls
 # --------------------------
+# Static portions of the status responses. Only the id field varies between
+# calls, so the long message strings are allocated once here and merged with
+# the id at call time instead of being rebuilt per invocation.
+_USER_ACTIVE = {
+    "status": "active",
+    "message": "Your account is active."
+}
+_USER_ONBOARDING = {
+    "status": "onboarding",
+    "message": (
+        "Your products aren't visible yet. Once onboarding is complete, "
+        "your account will be activated within 48 hours, and your listings "
+        "will go live."
+    )
+}
+_USER_ON_HOLD = {
+    "status": "on_hold",
+    "message": "Your account is on hold. Please contact support if you have questions."
+}
+
+_LISTING_BLOCKED = {
+    "status": "blocked",
+    "message": "Your listing is blocked due to seller state change.",
+    "block_reason": "seller_state_change"
+}
+_LISTING_INACTIVE = {
+    "status": "inactive",
+    "message": "Your listing is currently inactive. Please activate it to be visible."
+}
+_LISTING_ARCHIVED = {
+    "status": "archived",
+    "message": "Your listing is archived and not visible to customers."
+}
+_LISTING_RFA = {
+    "status": "rfa",
+    "message": "Your listing is pending approval (RFA)."
+}
+_LISTING_ACTIVE = {
+    "status": "active",
+    "message": "Your listing is active and visible to customers."
+}
+
+_BRAND_APPROVED = {
+    "status": "approved",
+    "message": "Your brand approval request is approved."
+}
+_BRAND_IN_PROGRESS = {
+    "status": "in_progress",
+    "message": "Brand approval is still in progress.",
+    "timeline_hours": 48
+}
+_BRAND_DISAPPROVED = {
+    "status": "disapproved",
+    "message": "Brand approval disapproved. Additional steps required.",
+    "timeline_hours": 80
+}
+
+
 def get_user_status(user_id: str = "default") -> dict:
     """
     Get the status of a user account.
@@ -93,18 +286,24 @@ def get_user_status(user_id: str = "default") -> dict:
                 "user_id": The user_id that was checked
             }
     """
-    print(f"\n🔴 [get_user_status] Received user_id: '{user_id}'")
+    _dbg("\n🔴 [get_user_status] Received user_id: '%s'", user_id)
     # Retry logic if user_id starts with "5"
-    if user_id.startswith("5"):
-        retry_key = f"user_{user_id}"
+    if user_id[:1] == "5":
+        retry_key = ("user", user_id)  # tuple key: no per-retry string build
         current_retry = increment_retry(retry_key)
-        print(f"🔄 [get_user_status] Retry count for {user_id}: {current_retry} (Max: {MAX_RETRIES})")
+        _dbg("🔄 [get_user_status] Retry count for %s: %s (Max: %s)", user_id, current_retry, MAX_RETRIES)
         if current_retry < MAX_RETRIES:
+            delay_ms = _retry_delay_ms(current_retry)
+            # Pace the auto-retry loop so SIA's immediate re-issue backs off
+            # instead of hammering the pipeline; the delay is also surfaced
+            # so higher layers can honor it themselves.
+            time.sleep(delay_ms / 1000)
             return {
                 "status": "retrying",
                 "message": f"Automatically retrying API call (attempt {current_retry}/{MAX_RETRIES})",
                 "retry_needed": True,
                 "auto_retry": True,
+                "retry_after_ms": delay_ms,
                 "user_id": user_id
             }
         else:
@@ -116,33 +315,33 @@ def get_user_status(user_id: str = "default") -> dict:
                 "user_id": user_id
             }
 
-    # Normal user status logic
-    if user_id.startswith("1"):
-        result = {
-            "status": "active",
-            "message": "Your account is active.",
-            "user_id": user_id
-        }
-    elif user_id.startswith("2"):
-        result = {
-            "status": "onboarding",
-            "message": (
-                "Your products aren't visible yet. Once onboarding is complete, "
-                "your account will be activated within 48 hours, and your listings "
-                "will go live."
-            ),
-            "user_id": user_id
-        }
-    else:
-        result = {
-            "status": "on_hold",
-            "message": "Your account is on hold. Please contact support if you have questions.",
-            "user_id": user_id
-        }
-    print(f"🔵 [get_user_status] Returning: {result}")
+    # Normal user status logic (deterministic, so memoized per id)
+    result = _user_status_core(user_id)
+    _dbg("🔵 [get_user_status] Returning: %s", result)
     return result
 
 
+@functools.lru_cache(maxsize=1024)
+@persistent_cache(ttl_seconds=86400)
+def _user_status_core(user_id: str) -> dict:
+    """
+    Deterministic portion of get_user_status, memoized per user_id.
+
+    The retry simulation for "5"-prefixed ids is handled by the caller;
+    everything else always maps the same id to the same result, so repeat
+    queries become cache hits. Callers must treat the dict as read-only.
+    """
+    # Branch on a one-character slice; cheaper than startswith for a
+    # single-char prefix
+    first = user_id[:1]
+    if first == "1":
+        return {**_USER_ACTIVE, "user_id": user_id}
+    elif first == "2":
+        return {**_USER_ONBOARDING, "user_id": user_id}
+    else:
+        return {**_USER_ON_HOLD, "user_id": user_id}
+
+
 def get_listing_status(listing_id: str = "default") -> dict:
     """
     Get the status of a product listing.
@@ -166,21 +365,24 @@ def get_listing_status(listing_id: str = "default") -> dict:
                 "listing_id": The listing_id that was checked
             }
     """
-    print(f"\n🔴 [get_listing_status] Received listing_id: '{listing_id}'")
+    _dbg("\n🔴 [get_listing_status] Received listing_id: '%s'", listing_id)
     # Retry logic if listing_id starts with "5"
-    if listing_id.startswith("5"):
-        retry_key = f"listing_{listing_id}"
+    if listing_id[:1] == "5":
+        retry_key = ("listing", listing_id)
         current_retry = increment_retry(retry_key)
-        print(f"🔄 [get_listing_status] Retry count for {listing_id}: {current_retry} (Max: {MAX_RETRIES})")
+        _dbg("🔄 [get_listing_status] Retry count for %s: %s (Max: %s)", listing_id, current_retry, MAX_RETRIES)
         if current_retry < MAX_RETRIES:
+            delay_ms = _retry_delay_ms(current_retry)
+            time.sleep(delay_ms / 1000)
             result = {
                 "status": "retrying",
                 "message": f"Automatically retrying API call (attempt {current_retry}/{MAX_RETRIES})",
                 "retry_needed": True,
                 "auto_retry": True,
+                "retry_after_ms": delay_ms,
                 "listing_id": listing_id
             }
-            print(f"DEBUG: [get_listing_status] Returning (auto-retry): {result}")
+            _dbg("DEBUG: [get_listing_status] Returning (auto-retry): %s", result)
             return result
         else:
             reset_retries(retry_key)
@@ -190,46 +392,39 @@ def get_listing_status(listing_id: str = "default") -> dict:
                 "retry_needed": False,
                 "listing_id": listing_id
             }
-            print(f"DEBUG: [get_listing_status] Returning (max retries reached): {result}")
+            _dbg("DEBUG: [get_listing_status] Returning (max retries reached): %s", result)
             return result
 
-    # Normal listing status logic
+    # Normal listing status logic (deterministic, so memoized per id)
+    result = _listing_status_core(listing_id)
+    _dbg("DEBUG: [get_listing_status] Returning: %s", result)
+    return result
+
+
+@functools.lru_cache(maxsize=1024)
+@persistent_cache(ttl_seconds=86400)
+def _listing_status_core(listing_id: str) -> dict:
+    """
+    Deterministic portion of get_listing_status, memoized per listing_id.
+
+    The retry simulation for "5"-prefixed ids is handled by the caller.
+    Callers must treat the returned dict as read-only.
+    """
     last_char = listing_id[-1] if listing_id else "0"
     if last_char == "2":
-        result = {
-            "status": "blocked",
-            "message": "Your listing is blocked due to seller state change.",
-            "block_reason": "seller_state_change",
-            "listing_id": listing_id
-        }
+        return {**_LISTING_BLOCKED, "listing_id": listing_id}
     elif last_char == "1":
-        result = {
-            "status": "inactive",
-            "message": "Your listing is currently inactive. Please activate it to be visible.",
-            "listing_id": listing_id
-        }
+        return {**_LISTING_INACTIVE, "listing_id": listing_id}
     elif last_char == "3":
-        result = {
-            "status": "archived",
-            "message": "Your listing is archived and not visible to customers.",
-            "listing_id": listing_id
-        }
+        return {**_LISTING_ARCHIVED, "listing_id": listing_id}
     elif last_char == "4":
-        result = {
-            "status": "rfa",
-            "message": "Your listing is pending approval (RFA).",
-            "listing_id": listing_id
-        }
+        return {**_LISTING_RFA, "listing_id": listing_id}
     else:
-        result = {
-            "status": "active",
-            "message": "Your listing is active and visible to customers.",
-            "listing_id": listing_id
-        }
-    print(f"DEBUG: [get_listing_status] Returning: {result}")
-    return result
+        return {**_LISTING_ACTIVE, "listing_id": listing_id}
 
 
+@functools.lru_cache(maxsize=1024)
+@persistent_cache(ttl_seconds=86400)
 def can_reactivate_listing(block_reason: str) -> dict:
     """
     Check if a blocked listing can be reactivated.
@@ -247,9 +442,9 @@ def can_reactivate_listing(block_reason: str) -> dict:
                 "message": Human-readable message with the result
             }
     """
-    print(f"\n🔴 [can_reactivate_listing] Received block_reason: '{block_reason}'")
+    _dbg("\n🔴 [can_reactivate_listing] Received block_reason: '%s'", block_reason)
     result = {"can_reactivate": True, "message": "Listing can be reactivated."}
-    print(f"🔵 [can_reactivate_listing] Returning: {result}")
+    _dbg("🔵 [can_reactivate_listing] Returning: %s", result)
     return result
 
 
@@ -273,13 +468,13 @@ def create_support_ticket(user_id: str, listing_id: str, reason: str) -> dict:
                 "message": Human-readable confirmation message
             }
     """
-    print(f"\n🔴 [create_support_ticket] Received user_id: '{user_id}', listing_id: '{listing_id}', reason: '{reason}'")
+    _dbg("\n🔴 [create_support_ticket] Received user_id: '%s', listing_id: '%s', reason: '%s'", user_id, listing_id, reason)
     result = {
         "ticket_id": "TICKET12345",
         "status": "created",
         "message": f"Support ticket created for user {user_id} regarding listing {listing_id}: {reason}"
     }
-    print(f"🔵 [create_support_ticket] Returning: {result}")
+    _dbg("🔵 [create_support_ticket] Returning: %s", result)
     return result
 
 
@@ -304,33 +499,103 @@ def get_brand_approval_status(request_id: str = "default") -> dict:
                 "timeline_hours": (Optional) Expected time to completion in hours
             }
     """
-    print(f"\n🔴 [get_brand_approval_status] Received request_id: '{request_id}'")
+    _dbg("\n🔴 [get_brand_approval_status] Received request_id: '%s'", request_id)
+    result = _brand_approval_core(request_id)
+    _dbg("🔵 [get_brand_approval_status] Returning: %s", result)
+    return result
 
+
+@functools.lru_cache(maxsize=1024)
+@persistent_cache(ttl_seconds=86400)
+def _brand_approval_core(request_id: str) -> dict:
+    """
+    Deterministic portion of get_brand_approval_status, memoized per request_id.
+
+    Callers must treat the returned dict as read-only.
+    """
     last_char = request_id[-1] if request_id else "0"
     if last_char == "1":
-        result = {
-            "status": "approved",
-            "message": "Your brand approval request is approved."
-        }
+        return {**_BRAND_APPROVED}
     elif last_char == "2":
-        result = {
-            "status": "in_progress",
-            "message": "Brand approval is still in progress.",
-            "timeline_hours": 48
-        }
+        return {**_BRAND_IN_PROGRESS}
     else:
-        result = {
-            "status": "disapproved",
-            "message": "Brand approval disapproved. Additional steps required.",
-            "timeline_hours": 80
-        }
-    print(f"🔵 [get_brand_approval_status] Returning: {result}")
-    return result
+        return {**_BRAND_DISAPPROVED}
 
 
 # --------------------------
 # Function Call Execution via FunctionExecutor
 # --------------------------
+# Dispatch table mapping function names to (callable, parameter keys, defaults).
+# A dict lookup replaces the previous if/elif cascade and makes registering a
+# new function a one-line change.
+_DISPATCH = {
+    "get_user_status": (get_user_status, ("user_id",), ("default",)),
+    "get_listing_status": (get_listing_status, ("listing_id",), ("default",)),
+    "can_reactivate_listing": (can_reactivate_listing, ("block_reason",), ("",)),
+    "create_support_ticket": (create_support_ticket, ("user_id", "listing_id", "reason"), ("", "", "")),
+    "get_brand_approval_status": (get_brand_approval_status, ("request_id",), ("",)),
+}
+
+# Parameter schemas for each registered function. fastjsonschema compiles
+# these to straight-line Python once at import time, so per-call validation
+# is cheap and rejects bad payloads with a specific message before they reach
+# the tool functions. Without fastjsonschema installed, params pass through
+# unvalidated exactly as before.
+_PARAM_SCHEMAS = {
+    "get_user_status": {
+        "type": "object",
+        "properties": {"user_id": {"type": "string"}}
+    },
+    "get_listing_status": {
+        "type": "object",
+        "properties": {"listing_id": {"type": "string"}}
+    },
+    "can_reactivate_listing": {
+        "type": "object",
+        "properties": {"block_reason": {"type": "string"}}
+    },
+    "create_support_ticket": {
+        "type": "object",
+        "properties": {
+            "user_id": {"type": "string"},
+            "listing_id": {"type": "string"},
+            "reason": {"type": "string"}
+        }
+    },
+    "get_brand_approval_status": {
+        "type": "object",
+        "properties": {"request_id": {"type": "string"}}
+    },
+}
+
+try:
+    import fastjsonschema
+    _VALIDATORS = {
+        name: fastjsonschema.compile(schema)
+        for name, schema in _PARAM_SCHEMAS.items()
+    }
+except ImportError:
+    _VALIDATORS = {}
+
+# Single-argument deterministic tools whose serialized response can be cached
+# verbatim: for a given id the JSON string is always identical, so repeat
+# calls skip both the tool dispatch and the JSON encoder. "5"-prefixed ids
+# (retry simulation) are excluded at the call site.
+_CACHEABLE_JSON = {
+    "get_user_status",
+    "get_listing_status",
+    "can_reactivate_listing",
+    "get_brand_approval_status",
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _call_json_cached(func_name: str, arg: str) -> str:
+    """Invoke a deterministic single-arg tool and cache its JSON encoding."""
+    fn = _DISPATCH[func_name][0]
+    return _dumps(fn(arg))
+
+
 class FunctionExecutorAgent(UserProxyAgent):
     """
     A specialized agent that executes function calls made by the SIA agent.
@@ -358,87 +623,180 @@ class FunctionExecutorAgent(UserProxyAgent):
         """
         if messages is None:
             messages = self._oai_messages[sender]
-        print(f"DEBUG [FunctionExecutor] Received messages from {sender.name}:")
-        for m in messages:
-            print("   ", m.get("content", ""))
+        if logger.isEnabledFor(logging.DEBUG):
+            _dbg("DEBUG [FunctionExecutor] Received messages from %s:", sender.name)
+            for m in messages:
+                _dbg("    %s", m.get("content", ""))
 
-        # We only check SIA's last message for function calls
-        sia_msgs = [m for m in messages if m.get("name") == "SIA"]
-        if not sia_msgs:
+        # We only check SIA's last message for function calls; scanning from
+        # the end stops at the first hit instead of filtering the whole history
+        last_msg = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("name") == "SIA"),
+            None
+        )
+        if last_msg is None:
             return None
+        _dbg("DEBUG [FunctionExecutor] Checking SIA message: %s", last_msg)
 
-        last_msg = sia_msgs[-1].get("content", "")
-        print(f"DEBUG [FunctionExecutor] Checking SIA message: {last_msg}")
+        # Cheap prefix test first: most messages are plain conversation, so
+        # reject them without ever invoking the regex engine. The bare prefix
+        # (no colon) also admits FUNCTION_CALL_BATCH messages.
+        if not last_msg.lstrip().startswith("FUNCTION_CALL"):
+            _dbg("⚠️ [FunctionExecutor] No valid function call detected")
+            return None
 
-        # Strict regex to detect function call
-        if re.search(r'^\s*FUNCTION_CALL:\w+\s*\{.*\}\s*$', last_msg, re.DOTALL):
-            print("🔧 [FunctionExecutor] Detected valid function call format")
+        # Strict regex to detect function call (single, inline-multiple or batch)
+        if _FUNC_CALL_MATCH_RE.match(last_msg) or _FUNC_CALL_BATCH_RE.match(last_msg):
+            _dbg("🔧 [FunctionExecutor] Detected valid function call format")
             return {"content": execute_function_call(last_msg)}
         else:
-            print("⚠️ [FunctionExecutor] No valid function call detected")
+            _dbg("⚠️ [FunctionExecutor] No valid function call detected")
             return None
 
 
+def _execute_one(func_name: str, params: dict) -> dict:
+    """
+    Dispatch a single parsed function call and return its result dict.
+
+    Args:
+        func_name: Name of the registered function to invoke
+        params: Parsed parameter dict for the call
+
+    Returns:
+        dict: The function result, or an error dict for unknown functions
+    """
+    entry = _DISPATCH.get(func_name)
+    if entry is None:
+        error_msg = f"❌ [execute_function_call] UNKNOWN FUNCTION: {func_name}"
+        _dbg(error_msg)
+        return {"status": "error", "message": error_msg}
+    validator = _VALIDATORS.get(func_name)
+    if validator is not None:
+        try:
+            validator(params)
+        except Exception as e:  # fastjsonschema.JsonSchemaException
+            error_msg = f"❌ [execute_function_call] INVALID PARAMS: {e}"
+            _dbg(error_msg)
+            return {"status": "error", "message": error_msg}
+    fn, keys, defaults = entry
+    return fn(*(params.get(k, d) for k, d in zip(keys, defaults)))
+
+
+async def _execute_batch(calls):
+    """
+    Run several parsed (func_name, params) calls concurrently.
+
+    The tool bodies stay synchronous; each call runs in a worker thread and
+    all are awaited together, so the latency of N independent simulated API
+    calls is their max rather than their sum.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(_execute_one, name, params) for name, params in calls)
+    )
+
+
+def _run_calls(calls):
+    """
+    Execute parsed (func_name, params) calls, overlapping them when there is
+    more than one. A single call runs inline with no event-loop overhead.
+    """
+    if len(calls) <= 1:
+        return [_execute_one(name, params) for name, params in calls]
+    return asyncio.run(_execute_batch(calls))
+
+
 def execute_function_call(message: str) -> str:
     """
     Parse and execute a function call message.
-    
-    This function takes a message in the format FUNCTION_CALL:<name>{<params>},
-    extracts the function name and parameters, executes the corresponding function,
-    and returns the result as a JSON string.
-    
+
+    Accepts a single FUNCTION_CALL:<name>{<params>} message, several such
+    calls concatenated in one message, or the explicit batch form
+    FUNCTION_CALL_BATCH:[{"name": ..., "params": {...}}, ...]. All calls in
+    one message execute in a single pass, so SIA can fold multiple status
+    checks into one executor round-trip instead of one per call.
+
     Args:
         message: The function call message to execute
-        
+
     Returns:
-        str: JSON-encoded result of the function call or error message
+        str: JSON-encoded result (or list of results, for batches)
     """
-    print(f"\n🔍 [execute_function_call] RAW INPUT:\n{message}\n{'='*50}")
+    _dbg("\n🔍 [execute_function_call] RAW INPUT:\n%s\n%s", message, '='*50)
     try:
-        pattern = r'^\s*FUNCTION_CALL:(\w+)\s*(\{.*\})\s*$'
-        match = re.search(pattern, message, re.DOTALL)
-        if not match:
+        # Prefix check rejects non-function-call text before any regex runs
+        if not message.lstrip().startswith("FUNCTION_CALL"):
             error_msg = "❌ [execute_function_call] INVALID FORMAT - Missing FUNCTION_CALL: prefix or malformed parameters"
-            print(error_msg)
-            return json.dumps({"status": "error", "message": error_msg})
-
-        func_name, params_str = match.groups()
-        print(f"✅ [execute_function_call] PARSED - Function: {func_name}, Params: {params_str}")
-
-        try:
-            params = json.loads(params_str)
-            print(f"🔧 [execute_function_call] VALIDATED PARAMS: {json.dumps(params, indent=2)}")
-        except json.JSONDecodeError as e:
-            error_msg = f"❌ [execute_function_call] INVALID JSON: {str(e)}"
-            print(error_msg)
+            _dbg(error_msg)
             return json.dumps({"status": "error", "message": error_msg})
 
-        # Dispatch the correct function
-        if func_name == "get_user_status":
-            result = get_user_status(params.get("user_id", "default"))
-        elif func_name == "get_listing_status":
-            result = get_listing_status(params.get("listing_id", "default"))
-        elif func_name == "can_reactivate_listing":
-            result = can_reactivate_listing(params.get("block_reason", ""))
-        elif func_name == "create_support_ticket":
-            result = create_support_ticket(
-                params.get("user_id", ""),
-                params.get("listing_id", ""),
-                params.get("reason", "")
+        # Explicit batch form
+        batch_match = _FUNC_CALL_BATCH_RE.match(message)
+        if batch_match:
+            try:
+                calls = _loads(batch_match.group(1))
+            except json.JSONDecodeError as e:
+                error_msg = f"❌ [execute_function_call] INVALID JSON: {str(e)}"
+                _dbg(error_msg)
+                return json.dumps({"status": "error", "message": error_msg})
+            results = _run_calls(
+                [(call.get("name", ""), call.get("params", {})) for call in calls]
             )
-        elif func_name == "get_brand_approval_status":
-            result = get_brand_approval_status(params.get("request_id", ""))
+            return _dumps(results)
+
+        # One or more inline FUNCTION_CALL:<name>{<params>} occurrences.
+        # A lone call is extracted with the greedy anchored regex so a '}'
+        # inside a JSON string value can't truncate the params; the
+        # non-greedy iterator only handles genuine multi-call messages.
+        if message.count("FUNCTION_CALL:") <= 1:
+            single = _FUNC_CALL_RE.match(message)
+            matches = [single.groups()] if single else []
         else:
-            error_msg = f"❌ [execute_function_call] UNKNOWN FUNCTION: {func_name}"
-            print(error_msg)
+            matches = _FUNC_CALL_ITER_RE.findall(message)
+        if not matches:
+            error_msg = "❌ [execute_function_call] INVALID FORMAT - Missing FUNCTION_CALL: prefix or malformed parameters"
+            _dbg(error_msg)
             return json.dumps({"status": "error", "message": error_msg})
 
-        print(f"✅ [execute_function_call] SUCCESS - Result:\n{json.dumps(result, indent=2)}")
-        return json.dumps(result, ensure_ascii=False)
+        # Fast path: a lone call to a deterministic single-arg tool returns a
+        # cached pre-serialized response (the str check doubles as the type
+        # validation the schema would perform for these one-key payloads)
+        if len(matches) == 1 and matches[0][0] in _CACHEABLE_JSON:
+            func_name, params_str = matches[0]
+            try:
+                params = _loads(params_str)
+            except json.JSONDecodeError:
+                params = None
+            if isinstance(params, dict):
+                _, keys, defaults = _DISPATCH[func_name]
+                arg = params.get(keys[0], defaults[0])
+                if isinstance(arg, str) and arg[:1] != "5":
+                    return _call_json_cached(func_name, arg)
+
+        results = []
+        pending = []  # (slot in results, func_name, params)
+        for func_name, params_str in matches:
+            _dbg("✅ [execute_function_call] PARSED - Function: %s, Params: %s", func_name, params_str)
+            try:
+                params = _loads(params_str)
+            except json.JSONDecodeError as e:
+                error_msg = f"❌ [execute_function_call] INVALID JSON: {str(e)}"
+                _dbg(error_msg)
+                results.append({"status": "error", "message": error_msg})
+                continue
+            results.append(None)
+            pending.append((len(results) - 1, func_name, params))
+        for (slot, _, _), res in zip(pending, _run_calls([(n, p) for _, n, p in pending])):
+            results[slot] = res
+
+        if logger.isEnabledFor(logging.DEBUG):
+            _dbg("✅ [execute_function_call] SUCCESS - Result:\n%s", json.dumps(results, indent=2))
+        if len(results) == 1:
+            return _dumps(results[0])
+        return _dumps(results)
 
     except Exception as e:
         error_msg = f"‼️ [execute_function_call] CRITICAL ERROR: {str(e)}"
-        print(error_msg)
+        _dbg(error_msg)
         return json.dumps({
             "status": "critical_error",
             "message": "System failure - contact support",
@@ -546,6 +904,8 @@ TEMPLATING AND STATUS COMMUNICATION:
    - FUNCTION_CALL:get_listing_status{"listing_id": "[ID]"}
    - FUNCTION_CALL:create_support_ticket{"user_id": "[USER_ID]", "listing_id": "[LISTING_ID]", "reason": "[REASON]"}
    - FUNCTION_CALL:get_brand_approval_status{"request_id": "[REQUEST_ID]"}
+   - When you already have every ID needed for several checks, issue them together in one message as a batch instead of one per turn:
+     FUNCTION_CALL_BATCH:[{"name": "get_user_status", "params": {"user_id": "[ID]"}}, {"name": "get_listing_status", "params": {"listing_id": "[ID]"}}]
 
 4. Always end the conversation with 'TERMINATE' if no further steps are needed.
 
@@ -599,41 +959,45 @@ def speaker_selection_func(last_speaker, groupchat):
     """
     messages = groupchat.messages
     if not messages:
-        return next(agent for agent in groupchat.agents if agent.name == "SIA")
+        return _AGENTS_BY_NAME["SIA"]
 
+    # Destructure the last message once; every branch below reads these locals
     last_msg = messages[-1]
-    content = last_msg.get("content", "")
-    sender = last_msg.get("name", "")
+    content = last_msg.get("content") or ""
+    sender = last_msg.get("name") or ""
 
     # Check for termination condition: message ends with TERMINATE
-    if content.rstrip().endswith("TERMINATE"):
-        print("DEBUG: Termination condition met in message. Chat will be terminated.")
+    if _ends_terminate(content):
+        _dbg("DEBUG: Termination condition met in message. Chat will be terminated.")
         return None
 
-    print("DEBUG: Last speaker was", sender, "content:", content[:50] if len(content) > 50 else content)
+    _dbg("DEBUG: Last speaker was %s content: %s", sender, content[:50] if len(content) > 50 else content)
 
-    # If SIA just output a function call => next is FunctionExecutor
-    if sender == "SIA" and re.search(r'^\s*FUNCTION_CALL:\w+\s*\{.*\}\s*$', content, re.DOTALL):
-        print("DEBUG: SIA issued function call -> FunctionExecutor will process")
-        return next(agent for agent in groupchat.agents if agent.name == "FunctionExecutor")
+    # Branches ordered by likelihood on the typical conversation flow:
+    # SIA -> FunctionExecutor -> SIA dominates, then User turns.
+    if sender == "SIA":
+        is_func_call = content.lstrip().startswith("FUNCTION_CALL") and (
+            _FUNC_CALL_MATCH_RE.match(content) is not None
+            or _FUNC_CALL_BATCH_RE.match(content) is not None)
+        # If SIA just output a function call => next is FunctionExecutor
+        if is_func_call:
+            _dbg("DEBUG: SIA issued function call -> FunctionExecutor will process")
+            return _AGENTS_BY_NAME["FunctionExecutor"]
+        # If SIA just gave a normal prompt => next is User
+        if "FUNCTION_CALL" not in content:
+            _dbg("DEBUG: SIA sent a prompt -> User will respond")
+            return _AGENTS_BY_NAME["User"]
+    elif sender == "FunctionExecutor":
+        # FunctionExecutor just returned a result => back to SIA
+        _dbg("DEBUG: FunctionExecutor returned result -> SIA will interpret")
+        return _AGENTS_BY_NAME["SIA"]
+    elif sender == "User":
+        # The last speaker was User => SIA responds
+        _dbg("DEBUG: User sent a message -> SIA will respond")
+        return _AGENTS_BY_NAME["SIA"]
 
-    # If SIA just gave a normal prompt => next is User
-    if sender == "SIA" and "FUNCTION_CALL:" not in content:
-        print("DEBUG: SIA sent a prompt -> User will respond")
-        return next(agent for agent in groupchat.agents if agent.name == "User")
-
-    # If FunctionExecutor just returned a result => back to SIA
-    if sender == "FunctionExecutor":
-        print("DEBUG: FunctionExecutor returned result -> SIA will interpret")
-        return next(agent for agent in groupchat.agents if agent.name == "SIA")
-
-    # If the last speaker is User => SIA responds
-    if sender == "User":
-        print("DEBUG: User sent a message -> SIA will respond")
-        return next(agent for agent in groupchat.agents if agent.name == "SIA")
-
-    print("DEBUG: Default fallback -> User will respond")
-    return next(agent for agent in groupchat.agents if agent.name == "User")
+    _dbg("DEBUG: Default fallback -> User will respond")
+    return _AGENTS_BY_NAME["User"]
 
 
 # --------------------------
@@ -648,6 +1012,10 @@ groupchat = CustomGroupChat(
     func_call_filter=True
 )
 
+# Name -> agent lookup built once; speaker selection runs for every message,
+# so an O(1) dict fetch beats re-scanning groupchat.agents each time.
+_AGENTS_BY_NAME = {agent.name: agent for agent in groupchat.agents}
+
 manager = GroupChatManager(
     groupchat=groupchat,
     llm_config={
@@ -655,7 +1023,7 @@ manager = GroupChatManager(
         "temperature": 0,
         "timeout": 120
     },
-    is_termination_msg=lambda msg: msg.get("content", "").rstrip().endswith("TERMINATE")
+    is_termination_msg=lambda msg: _ends_terminate(msg.get("content", ""))
 )
 
 # --------------------------
@@ -669,11 +1037,11 @@ def start_chat():
     and begins the conversation flow. It handles the entire chat session
     until termination.
     """
-    print("\n🔍 DEBUG: Starting new chat session")
-    print("DEBUG: Agent order:", [a.name for a in groupchat.agents])
-    print("DEBUG: SIA system message:\n", sia.system_message)
+    _dbg("\n🔍 DEBUG: Starting new chat session")
+    _dbg("DEBUG: Agent order: %s", [a.name for a in groupchat.agents])
+    _dbg("DEBUG: SIA system message:\n%s", sia.system_message)
     try:
-        print("DEBUG: Initiating chat with message: 'I need help with my listing or brand approval'")
+        _dbg("DEBUG: Initiating chat with message: 'I need help with my listing or brand approval'")
         user_agent.initiate_chat(
             manager,
             message="I need help with my listing or brand approval",